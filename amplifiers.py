@@ -0,0 +1,64 @@
+from typing import List, Tuple
+from itertools import groupby
+import os
+import time
+from lazy import lazyImport
+
+futures = lazyImport('concurrent.futures')
+
+
+def searchChunk(calculate, memory: List[int], permutations: List[Tuple[int]]):
+    # phase prefix -> signal, shared by every permutation of this chunk
+    cache = {}
+    max_signal = None
+    max_permutation = None
+
+    start = time.perf_counter()
+    for permutation in permutations:
+        signal = calculate(memory, permutation, cache)
+        if max_signal is None or signal > max_signal:
+            max_signal = signal
+            max_permutation = permutation
+
+    return max_signal, max_permutation, os.getpid(), len(permutations), time.perf_counter() - start
+
+def splitByPrefix(permutations: List[Tuple[int]], workers: int) -> List[List[Tuple[int]]]:
+    # lengthen the shared prefix until there is a chunk for every worker
+    permutations = sorted(permutations)
+    length = max((len(permutation) for permutation in permutations), default=0)
+    prefix = 1
+    while True:
+        chunks = [list(group) for _, group in groupby(permutations, key=lambda permutation: permutation[:prefix])]
+        if len(chunks) >= workers or prefix >= length:
+            return chunks
+        prefix += 1
+
+def searchPermutations(calculate, memory: List[int], permutations: List[Tuple[int]], workers: int = None):
+    """Finds the permutation with the strongest signal using a process pool.
+
+    calculate(memory, permutation, cache) is called for every permutation.
+    Permutations sharing a phase prefix go to the same chunk, so a calculate
+    memoizing on phase prefixes can reuse them. Returns the best
+    signal, its permutation and the {pid: (permutations, seconds)} stats of
+    the workers.
+    """
+    chunks = splitByPrefix(permutations, workers or os.cpu_count())
+    max_signal = None
+    max_permutation = None
+    stats = {}
+
+    with futures.ProcessPoolExecutor(workers) as executor:
+        submitted = [executor.submit(searchChunk, calculate, memory, chunk) for chunk in chunks]
+        for future in submitted:
+            signal, permutation, pid, count, elapsed = future.result()
+            if max_signal is None or signal > max_signal:
+                max_signal = signal
+                max_permutation = permutation
+            done, seconds = stats.get(pid, (0, 0.0))
+            stats[pid] = (done + count, seconds + elapsed)
+
+    return max_signal, max_permutation, stats
+
+def printWorkerStats(stats):
+    for pid, (count, seconds) in sorted(stats.items()):
+        print(f'Worker |{pid}|: {count} permutations in {seconds:.3f}s, {count / max(seconds, 1e-9):.1f} permutations/s')
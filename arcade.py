@@ -0,0 +1,149 @@
+from array import array
+import random
+import time
+from intcode import executeProgram, ThreadState, AWAITING_INPUT
+from lazy import lazyImport, sign
+
+np = lazyImport('numpy')
+futures = lazyImport('concurrent.futures')
+
+EMPTY, WALL, BLOCK, PADDLE, BALL = range(5)
+
+
+class ArcadeScreen(object):
+    """Incremental model of the arcade cabinet screen.
+
+    Output values are fed in as they come, every complete (x, y, tile)
+    triple updates the tile grid, the tracked ball, paddle and score, so a
+    frame costs only its new tiles. With record_deltas the triples of each
+    frame are also kept in a flat int log for replays.
+    """
+
+    def __init__(self, record_deltas = False):
+        self.tiles = np.zeros((0, 0), dtype=np.uint8)
+        self.ball = None
+        self.paddle = None
+        self.score = 0
+        self.blocks = 0
+        self.pending = []
+
+        self.record_deltas = record_deltas
+        self.deltas = array('q')
+        # deltas[frames[i]:frames[i + 1]] holds the flattened triples of frame i
+        self.frames = array('q', [0])
+
+    def ensureSize(self, x, y):
+        height, width = self.tiles.shape
+        if y < height and x < width:
+            return
+        grown = np.zeros((max(height, y + 1), max(width, x + 1)), dtype=np.uint8)
+        grown[:height, :width] = self.tiles
+        self.tiles = grown
+
+    def draw(self, x, y, tile):
+        if self.record_deltas:
+            self.deltas.extend((x, y, tile))
+
+        if x == -1 and y == 0:
+            self.score = tile
+            return
+
+        self.ensureSize(x, y)
+        previous = int(self.tiles[y, x])
+        self.tiles[y, x] = tile
+        self.blocks += (tile == BLOCK) - (previous == BLOCK)
+        if tile == BALL:
+            self.ball = (x, y)
+        elif tile == PADDLE:
+            self.paddle = (x, y)
+
+    def push(self, value):
+        self.pending.append(value)
+        if len(self.pending) == 3:
+            self.draw(*self.pending)
+            self.pending = []
+
+    def update(self, values):
+        for value in values:
+            self.push(value)
+
+    def endFrame(self):
+        if self.record_deltas:
+            self.frames.append(len(self.deltas))
+
+    def frameCount(self):
+        return len(self.frames) - 1
+
+    def frameDeltas(self, frame):
+        start, end = self.frames[frame], self.frames[frame + 1]
+        return [tuple(self.deltas[i:i + 3]) for i in range(start, end, 3)]
+
+
+def followBall(screen):
+    if screen.ball is None or screen.paddle is None:
+        return 0
+    return sign(screen.ball[0] - screen.paddle[0])
+
+
+class RandomPolicy(object):
+    """Seeded random joystick, for fuzzing the cabinet program."""
+
+    def __init__(self, seed = None):
+        self.random = random.Random(seed)
+
+    def __call__(self, screen):
+        return self.random.choice((-1, 0, 1))
+
+
+def playGame(memory, policy = followBall, max_frames = None, record_deltas = False):
+    """Plays one game headless, asking policy(screen) for the joystick every frame.
+
+    Returns the final screen and a stats dict with score, frames,
+    instructions and their rates.
+    """
+    memory = memory.copy()
+    memory[0] = 2
+
+    state = ThreadState(memory, 0, [], [])
+    screen = ArcadeScreen(record_deltas)
+    game = executeProgram(state)
+    frames = 0
+
+    start = time.perf_counter()
+    try:
+        value = next(game)
+        while True:
+            if value is AWAITING_INPUT:
+                screen.endFrame()
+                frames += 1
+                if max_frames is not None and frames >= max_frames:
+                    break
+                value = game.send(policy(screen))
+            else:
+                screen.push(value)
+                value = next(game)
+    except StopIteration:
+        # the frame drawn before the halt counts like any other
+        screen.endFrame()
+        frames += 1
+    elapsed = max(time.perf_counter() - start, 1e-9)
+
+    return screen, {
+        'score': screen.score,
+        'blocks_left': screen.blocks,
+        'frames': frames,
+        'instructions': state.steps,
+        'seconds': elapsed,
+        'frames_per_second': frames / elapsed,
+        'instructions_per_second': state.steps / elapsed,
+    }
+
+def playStats(memory, policy, max_frames = None):
+    # the screen stays in the worker, only the stats travel back
+    return playGame(memory, policy, max_frames)[1]
+
+def runGames(memory, policies, max_frames = None, workers = None):
+    """Plays a game per policy across a process pool, policies must be picklable."""
+    with futures.ProcessPoolExecutor(workers) as executor:
+        submitted = [executor.submit(playStats, memory, policy, max_frames) for policy in policies]
+        return [future.result() for future in submitted]
@@ -1,60 +1,120 @@
 import math
-from itertools import cycle
+from functools import cmp_to_key
+from lazy import lazyImport
 
-def visibilityScore(points, current_point):
-    return len(set([math.atan2(current_point[1] - point[1], current_point[0] - point[0]) for point in points]))
-
-
-
-def calculateBestStation(asteroids):
-    max = 0
-    max_point = None
-
-    for point in asteroids:
-        current_visibility = visibilityScore(asteroids - set([point]), point)
-        if current_visibility > max:
-            max = current_visibility
-            max_point = point
-
-    return max, max_point
+np = lazyImport('numpy')
 
-def mapAsteroidsToTangents(asteroids, pov):
-    tangent_map = dict()
 
-    for asteroid in asteroids:
-        tangent = math.atan2(pov[1] - asteroid[1], pov[0] - asteroid[0])
-        if tangent in tangent_map:
-            tangent_map[tangent].append(asteroid)
-        else:
-            tangent_map[tangent] = [asteroid]
+def reducedDirection(dx, dy):
+    divisor = math.gcd(dx, dy)
+    return dx // divisor, dy // divisor
 
-    # sorting tangent lines based on distance from pov
-    for tangent in tangent_map.keys():
-        tangent_map[tangent] = sorted(tangent_map[tangent],\
-            key = lambda asteroid: math.sqrt((pov[0] - asteroid[0]) ** 2 + (pov[1] - asteroid[1]) ** 2))
-
-    rotate90 = lambda radian: radian - math.radians(90)
-    normalize = lambda radian: radian if 0 <= radian <= math.radians(360) else radian + math.radians(360)
-    return {normalize(rotate90(key)):tangent_map[key] for key in tangent_map.keys()}
-
-
-def vaporizeAsteroids(asteroids, station, remaining_shots = -1):
-    last_vaporized = None
-    tangent_map = mapAsteroidsToTangents(asteroids, station)
-    asteroid_angles = cycle(sorted(tangent_map.keys()))
-    cannon_angle = next(asteroid_angles)
-
-    while remaining_shots != 0 and len(tangent_map) != 0:
-        if cannon_angle in tangent_map:
-            last_vaporized = tangent_map[cannon_angle][0]
-            tangent_map[cannon_angle] = tangent_map[cannon_angle][1:]
-            if len(tangent_map[cannon_angle]) == 0:
-                del tangent_map[cannon_angle]
-            remaining_shots -= 1
+def visibilityScore(points, current_point):
+    return len(set([reducedDirection(point[0] - current_point[0], point[1] - current_point[1])
+        for point in points if point != current_point]))
+
+
+class VisibilityIndex(object):
+    """Exact line of sight queries over an asteroid field.
+
+    Directions are gcd-reduced integer (dx, dy) vectors, so asteroids on
+    one line always share a key. Per-station direction maps are cached.
+    """
+
+    def __init__(self, asteroids, vectorized = True):
+        self.asteroids = list(asteroids)
+        self.vectorized = vectorized
+        self.stations = {}
+        self.vaporizations = {}
+        if vectorized:
+            self.xs = np.array([asteroid[0] for asteroid in self.asteroids], dtype=np.int64)
+            self.ys = np.array([asteroid[1] for asteroid in self.asteroids], dtype=np.int64)
+
+    def visibleCounts(self):
+        if not self.vectorized:
+            return [visibilityScore(self.asteroids, station) for station in self.asteroids]
+
+        counts = []
+        for x, y in zip(self.xs, self.ys):
+            dx = self.xs - x
+            dy = self.ys - y
+            divisors = np.gcd(dx, dy)
+            others = divisors > 0
+            dx = dx[others] // divisors[others]
+            dy = dy[others] // divisors[others]
+            # reduced components are bounded by the field size, pack them in one int
+            counts.append(len(np.unique((dx << 32) + dy)))
+        return counts
+
+    def bestStation(self):
+        counts = self.visibleCounts()
+        best = max(range(len(counts)), key=lambda i: counts[i], default=None)
+        if best is None:
+            return 0, None
+        return counts[best], self.asteroids[best]
+
+    def directions(self, station):
+        """Maps each direction from station to its asteroids, nearest first."""
+        if station not in self.stations:
+            lines = dict()
+            for asteroid in self.asteroids:
+                if asteroid != station:
+                    dx, dy = asteroid[0] - station[0], asteroid[1] - station[1]
+                    lines.setdefault(reducedDirection(dx, dy), []).append(asteroid)
+            for line in lines.values():
+                line.sort(key=lambda asteroid: (asteroid[0] - station[0]) ** 2 + (asteroid[1] - station[1]) ** 2)
+            self.stations[station] = lines
+        return self.stations[station]
+
+    def vaporized(self, station):
+        """The full vaporization order from station, the k-th shot is vaporized(station)[k - 1]."""
+        if station not in self.vaporizations:
+            self.vaporizations[station] = list(vaporizationOrder(self.directions(station)))
+        return self.vaporizations[station]
 
-        cannon_angle = next(asteroid_angles)
 
-    return last_vaporized
+def calculateBestStation(asteroids):
+    return VisibilityIndex(asteroids).bestStation()
+
+def laserHalf(direction):
+    # the laser starts pointing up (y grows downwards) and turns clockwise,
+    # the first half turn covers up and everything to the right of it
+    dx, dy = direction
+    return 0 if dx > 0 or (dx == 0 and dy < 0) else 1
+
+def compareLaserAngles(direction1, direction2):
+    half1, half2 = laserHalf(direction1), laserHalf(direction2)
+    if half1 != half2:
+        return half1 - half2
+    # within a half turn a positive cross product means direction2 is hit later
+    return direction2[0] * direction1[1] - direction1[0] * direction2[1]
+
+def vaporizationOrder(lines):
+    """Lazily yields asteroids in the order the laser destroys them.
+
+    lines maps directions to asteroids nearest first, as from
+    VisibilityIndex.directions. Every rotation hits the next asteroid of each
+    remaining line in angle order.
+    """
+    active = [lines[direction] for direction in sorted(lines, key=cmp_to_key(compareLaserAngles))]
+    rotation = 0
+    while active:
+        for line in active:
+            yield line[rotation]
+        rotation += 1
+        active = [line for line in active if len(line) > rotation]
+
+
+def vaporizeAsteroids(asteroids, station, remaining_shots = -1, index = None):
+    if index is None:
+        index = VisibilityIndex(asteroids, vectorized=False)
+
+    order = index.vaporized(station)
+    if remaining_shots == 0 or not order:
+        return None
+    if remaining_shots < 0 or remaining_shots > len(order):
+        return order[-1]
+    return order[remaining_shots - 1]
 
 if __name__ == "__main__":
     with open('day10.txt', 'r') as f:
@@ -65,7 +125,8 @@ if __name__ == "__main__":
                 if lines[y][x] == '#':
                     points.append((x, y))
     
-    max_score, max_point = calculateBestStation(set(points))
+    index = VisibilityIndex(points)
+    max_score, max_point = index.bestStation()
     print(max_score)
-    vaporized_200th = vaporizeAsteroids(set(points) - set(max_point), max_point, 200)
+    vaporized_200th = vaporizeAsteroids(points, max_point, 200, index)
     print(100 * vaporized_200th[0] + vaporized_200th[1])
\ No newline at end of file
@@ -1,14 +1,7 @@
-from intcode import interpretProgram, ThreadState, ProgramPause, readProgram
-import matplotlib.pyplot as plt
+from intcode import executeProgram, ThreadState, readProgram
+from painting import PaintingGrid, DIRECTIONS
 
 
-def rotateLeft(direction):
-    return [-1 * direction[1], direction[0]]
-
-
-def rotateRight(direction):
-    return [direction[1], -1 * direction[0]]
-
 def readPixel(painting, position):
     if position not in painting:
         return 0
@@ -16,38 +9,30 @@ def readPixel(painting, position):
     return painting[position]
 
 def runProgram(memory, painting):
-    direction = [0, 1]
+    direction = 0
     position = (0, 0)
 
-    state = ThreadState(memory, 0, [], [])
+    robot = executeProgram(ThreadState(memory, 0, [], []))
+    next(robot)
 
-    while True:
-        try:
-            pixel = readPixel(painting, position)
-            state.input_stream.append(pixel)
-            interpretProgram(state)
-            break
-        except ProgramPause:
-            color, turn = state.output[-2:]
+    try:
+        while True:
+            color = robot.send(readPixel(painting, position))
+            turn = next(robot)
             painting[position] = color
-            
-            if turn == 0:
-                direction = rotateLeft(direction)
-            else:
-                direction = rotateRight(direction)
-            position = (position[0] + direction[0], position[1] + direction[1])
 
-    color = state.output[-2]
-    painting[position] = color
+            direction = (direction + (1 if turn else -1)) % 4
+            dx, dy = DIRECTIONS[direction]
+            position = (position[0] + dx, position[1] + dy)
+            next(robot)
+    except StopIteration:
+        pass
 
 
 def renderPainting(painting):
-    white_coords = [xy for xy in painting.keys() if painting[xy] == 1]
-    x = [xy[0] for xy in white_coords]
-    y = [xy[1] for xy in white_coords]
-
-    plt.scatter(x, y)
-    plt.show()
+    if isinstance(painting, dict):
+        painting = PaintingGrid.fromDict(painting)
+    print(painting.toASCII())
 
 
 if __name__ == "__main__":
@@ -55,11 +40,12 @@ if __name__ == "__main__":
         memory = readProgram(f)
 
     #part 1
-    painting = dict()
+    painting = PaintingGrid()
     runProgram(memory.copy(), painting)
     print(len(painting))
 
     # part 2
-    painting = {(0, 0): 1}
+    painting = PaintingGrid()
+    painting[(0, 0)] = 1
     runProgram(memory.copy(), painting)
     renderPainting(painting)
\ No newline at end of file
@@ -1,99 +1,67 @@
-import numpy as np
 import copy
 import math
+from lazy import lazyImport
+
+np = lazyImport('numpy')
+futures = lazyImport('concurrent.futures')
 
 def lineToPlanet(line):
     clean_str = lambda string: string.replace('<', '').replace('>', '').replace('x=', '').replace('y=', '').replace('z=', '')
     line_split = clean_str(line).split(', ')
     return { 'posx': int(line_split[0]), 'posy': int(line_split[1]), 'posz': int(line_split[2]), 'velx': 0, 'vely': 0, 'velz': 0}
 
-def getTotalEnergy(planets, steps):
+def planetsToArrays(planets):
+    positions = np.array([[planet['posx'], planet['posy'], planet['posz']] for planet in planets], dtype=np.int64)
+    velocities = np.array([[planet['velx'], planet['vely'], planet['velz']] for planet in planets], dtype=np.int64)
+    return positions, velocities
+
+def simulate(positions, velocities, steps):
+    """Steps (..., N, 3) position and velocity arrays in place.
 
-    while steps > 0:
-        # apply gravity
-        for planet in planets:
-            velx = 0
-            vely = 0
-            velz = 0
-            for other in planets:
-                velx += np.sign(other['posx'] - planet['posx'])
-                vely += np.sign(other['posy'] - planet['posy'])
-                velz += np.sign(other['posz'] - planet['posz'])
-            planet['velx'] += velx
-            planet['vely'] += vely
-            planet['velz'] += velz
-
-
-        
-        # apply velocity
-        for planet in planets:
-            planet['posx'] += planet['velx']
-            planet['posy'] += planet['vely']
-            planet['posz'] += planet['velz']
-        steps -= 1
-
-    summa = 0
-    # calculate total energies
-    for planet in planets:
-        planet['pot'] = np.abs(planet['posx']) + np.abs(planet['posy']) + np.abs(planet['posz'])
-        planet['kin'] = np.abs(planet['velx']) + np.abs(planet['vely']) + np.abs(planet['velz'])
-        planet['total'] = planet['pot'] * planet['kin']
-        summa += planet['total']
-
-    return summa
+    Leading dimensions are independent systems stepped together.
+    """
+    for _ in range(steps):
+        velocities += np.sign(positions[..., None, :, :] - positions[..., :, None, :]).sum(axis=-2)
+        positions += velocities
+    return positions, velocities
+
+def totalEnergy(positions, velocities):
+    return (np.abs(positions).sum(axis=-1) * np.abs(velocities).sum(axis=-1)).sum(axis=-1)
+
+def getTotalEnergy(planets, steps):
+    positions, velocities = planetsToArrays(planets)
+    simulate(positions, velocities, steps)
+    return int(totalEnergy(positions, velocities))
 
 def lcm(a,b):
     return a*b // math.gcd(a,b)
 
+def axisCycleLength(positions, velocities):
+    """Steps one axis of the system until it returns to its initial state.
+
+    The motion is reversible, so the first repeated state is the initial one
+    and only that needs to be remembered.
+    """
+    initial_positions = positions.copy()
+    initial_velocities = velocities.copy()
+    positions = positions.copy()
+    velocities = velocities.copy()
+
+    steps = 0
+    while True:
+        velocities += np.sign(positions[None, :] - positions[:, None]).sum(axis=1)
+        positions += velocities
+        steps += 1
+        if np.array_equal(velocities, initial_velocities) and np.array_equal(positions, initial_positions):
+            return steps
+
 def getCycleLength(planets):
-    xcycle = None
-    ycycle = None
-    zcycle = None
-    histx = set()
-    histy = set()
-    histz = set()
-
-
-    while xcycle == None or ycycle == None or zcycle == None:
-        # update history
-        statex = tuple([(planet['posx'], planet['velx']) for planet in planets])
-        statey = tuple([(planet['posy'], planet['vely']) for planet in planets])
-        statez = tuple([(planet['posz'], planet['velz']) for planet in planets])
-        if statex in histx:
-            xcycle = len(histx)
-        else:
-            histx.add(statex)
-
-        if statey in histy:
-            ycycle = len(histy)
-        else:
-            histy.add(statey)
-        
-        if statez in histz:
-            zcycle = len(histz)
-        else:
-            histz.add(statez)
-
-        # apply gravity
-        for planet in planets:
-            velx = 0
-            vely = 0
-            velz = 0
-            for other in planets:
-                velx += np.sign(other['posx'] - planet['posx'])
-                vely += np.sign(other['posy'] - planet['posy'])
-                velz += np.sign(other['posz'] - planet['posz'])
-            planet['velx'] += velx
-            planet['vely'] += vely
-            planet['velz'] += velz
-
-        # apply velocity
-        for planet in planets:
-            planet['posx'] += planet['velx']
-            planet['posy'] += planet['vely']
-            planet['posz'] += planet['velz']
-
-    lcm_nums = [xcycle, ycycle, zcycle]
+    positions, velocities = planetsToArrays(planets)
+
+    # the axes do not interact, each one runs in its own process
+    with futures.ProcessPoolExecutor(3) as executor:
+        lcm_nums = list(executor.map(axisCycleLength, positions.T.copy(), velocities.T.copy()))
+
     answer = lcm_nums[0]
     for num in lcm_nums[1:]:
         answer = lcm(answer, num)
@@ -1,4 +1,5 @@
 import sys
 import math
 
-print(sum([math.floor(float(line)/3) - 2 for line in sys.stdin.readlines()]))
\ No newline at end of file
+if __name__ == "__main__":
+    print(sum([math.floor(float(line)/3) - 2 for line in sys.stdin.readlines()]))
\ No newline at end of file
@@ -10,4 +10,5 @@ def calculateFuel(n):
         fuel = 0
     return fuel + calculateFuel(fuel)
 
-print(sum([calculateFuel(int(line)) for line in sys.stdin.readlines()]))
+if __name__ == "__main__":
+    print(sum([calculateFuel(int(line)) for line in sys.stdin.readlines()]))
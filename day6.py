@@ -1,44 +1,131 @@
+from typing import Dict, List, Sequence, Tuple
+from array import array
 
 
-def calculateRoute(parent_dict, child):
-    if child in parent_dict:
-        return 1 + calculateRoute(parent_dict, parent_dict[child])
+def loadOrbits(file, chunk_size: int = 1 << 20) -> Tuple[List[str], array, Dict[str, int]]:
+    """Streams an orbit map, interning body names to ids as they appear.
 
-    return 0
+    Returns the names by id, the parent id of every body (-1 for roots) and
+    the name to id mapping.
+    """
+    names = []
+    ids = {}
+    parents = array('i')
 
-def calculateAllRoutes(parent_dict):
-    sum = 0
+    def intern(name):
+        body = ids.get(name)
+        if body is None:
+            body = ids[name] = len(names)
+            names.append(name)
+            parents.append(-1)
+        return body
 
-    for node in parent_dict.keys():
-        sum += calculateRoute(parent_dict, node)
+    def addLines(lines):
+        for line in lines:
+            line = line.strip()
+            if line:
+                parent, child = line.split(')')
+                parents[intern(child)] = intern(parent)
+
+    remainder = ''
+    chunk = file.read(chunk_size)
+    while chunk:
+        lines = (remainder + chunk).split('\n')
+        remainder = lines.pop()
+        addLines(lines)
+        chunk = file.read(chunk_size)
+    addLines([remainder])
+
+    return names, parents, ids
+
+
+class OrbitIndex(object):
+    """Depths and binary lifting ancestor tables of an orbit map, built once.
+
+    Bodies are numbered 0..n-1, parents[i] is the body i orbits or -1.
+    Names are only needed to resolve queries, the tables are int arrays.
+    """
+
+    def __init__(self, names: List[str], parents: Sequence[int], ids: Dict[str, int] = None):
+        self.names = names
+        self.ids = ids if ids is not None else {name: i for i, name in enumerate(names)}
+        self.depths = self.calculateDepths(parents)
 
-    return sum
+        # up[k][i] is the 2^k-th ancestor of i, roots are their own ancestors
+        self.up = [array('i', (i if parent < 0 else parent for i, parent in enumerate(parents)))]
+        for _ in range(max(self.depths, default=0).bit_length() - 1):
+            previous = self.up[-1]
+            self.up.append(array('i', (previous[ancestor] for ancestor in previous)))
 
-def getAncestors(parent_dict, child):
+    @staticmethod
+    def calculateDepths(parents: Sequence[int]) -> array:
+        depths = array('i', [-1]) * len(parents)
+        for body in range(len(parents)):
+            # climb to the first body with a known depth, then fill the path top down
+            path = []
+            while body >= 0 and depths[body] < 0:
+                path.append(body)
+                body = parents[body]
+            depth = depths[body] if body >= 0 else -1
+            for body in reversed(path):
+                depth += 1
+                depths[body] = depth
+        return depths
 
-    ancestorList = []
+    @classmethod
+    def fromParentDict(cls, parent_dict: Dict[str, str]) -> 'OrbitIndex':
+        names = list(set(parent_dict.keys()) | set(parent_dict.values()))
+        ids = {name: i for i, name in enumerate(names)}
+        parents = [ids[parent_dict[name]] if name in parent_dict else -1 for name in names]
+        return cls(names, parents)
 
-    current = parent_dict[child]
-    while current in parent_dict:
-        ancestorList.append(current)
-        current = parent_dict[current]
-    
-    return ancestorList
+    @classmethod
+    def fromFile(cls, file, chunk_size: int = 1 << 20) -> 'OrbitIndex':
+        return cls(*loadOrbits(file, chunk_size))
 
-def getRouteBetween(parent_dict, child1, child2):
-    ancestorList1 = getAncestors(parent_dict, child1)
-    ancestorList2 = getAncestors(parent_dict, child2)
+    def totalOrbits(self) -> int:
+        return sum(self.depths)
+
+    def ancestor(self, body: int, distance: int) -> int:
+        level = 0
+        while distance:
+            if distance & 1:
+                body = self.up[level][body]
+            distance >>= 1
+            level += 1
+        return body
+
+    def commonAncestor(self, body1: int, body2: int) -> int:
+        depths = self.depths
+        if depths[body1] < depths[body2]:
+            body1, body2 = body2, body1
+        body1 = self.ancestor(body1, depths[body1] - depths[body2])
+        if body1 == body2:
+            return body1
+
+        for level in reversed(self.up):
+            if level[body1] != level[body2]:
+                body1, body2 = level[body1], level[body2]
+        return self.up[0][body1]
+
+    def orbited(self, name: str) -> int:
+        body = self.ids[name]
+        parent = self.up[0][body]
+        if parent == body:
+            raise KeyError(f'Body |{name}| does not orbit anything')
+        return parent
+
+    def transfers(self, name1: str, name2: str) -> int:
+        # orbital transfers between the bodies name1 and name2 orbit
+        body1, body2 = self.orbited(name1), self.orbited(name2)
+        common = self.commonAncestor(body1, body2)
+        return self.depths[body1] + self.depths[body2] - 2 * self.depths[common]
 
-    return len(set(ancestorList1).symmetric_difference(set(ancestorList2)))
 
 if __name__ == "__main__":
     with open('day6.txt', 'r') as f:
-        lines = f.readlines()
-        parent_dict = {}
-        for line in lines:
-            parent, child = line.strip().split(')')
-            parent_dict[child] = parent
-            
-    print(calculateAllRoutes(parent_dict))
-    print(getRouteBetween(parent_dict, 'YOU', 'SAN'))
+        index = OrbitIndex.fromFile(f)
+
+    print(index.totalOrbits())
+    print(index.transfers('YOU', 'SAN'))
 
@@ -1,20 +1,38 @@
 from intcode import readProgram, interpretProgram, ThreadState
+from amplifiers import searchPermutations, printWorkerStats
 import itertools
-from tqdm import tqdm
+import sys
+from lazy import lazyImport
 
-def calculateSignal(memory, permutation):
-    output = interpretProgram(ThreadState(memory.copy(), 0, [permutation[0], 0], []))[0]
-    for phase in permutation[1:]:
-        output = interpretProgram(ThreadState(memory.copy(), 0, [phase, output], []))[0]
+tqdm = lazyImport('tqdm')
+
+def calculateSignal(memory, permutation, cache = None):
+    if cache is None:
+        cache = {}
+
+    output = 0
+    for i, phase in enumerate(permutation):
+        prefix = permutation[:i + 1]
+        if prefix not in cache:
+            cache[prefix] = interpretProgram(ThreadState(memory.copy(), 0, [phase, output], []))[0]
+        output = cache[prefix]
 
     return output
 
-def findConfiguration(memory):
+def findConfiguration(memory, workers = None):
     all_permutations = list(itertools.permutations(range(0,5), 5))
+
+    if workers:
+        max_signal, permutation, stats = searchPermutations(calculateSignal, memory, all_permutations, workers)
+        printWorkerStats(stats)
+        print(f'Max signal: |{max_signal}| for config |{permutation}|')
+        return
+
     max_signal = 0
+    cache = {}
 
-    for permutation in tqdm(all_permutations):
-        signal = calculateSignal(memory, permutation)
+    for permutation in tqdm.tqdm(all_permutations):
+        signal = calculateSignal(memory, permutation, cache)
         if signal > max_signal:
             max_signal = signal
             print(f'New max signal of strength |{signal}| for config |{permutation}|')
@@ -25,4 +43,5 @@ if __name__ == "__main__":
     with open('day7.txt', 'r') as f:
         memory = readProgram(f)
     
-    findConfiguration(memory)
\ No newline at end of file
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else None
+    findConfiguration(memory, workers)
\ No newline at end of file
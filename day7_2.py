@@ -1,29 +1,27 @@
-from intcode import readProgram, interpretProgram, ThreadState, ProgramPause
+from intcode import readProgram, ThreadState
+from scheduler import runNetwork, ring
+from amplifiers import searchPermutations, printWorkerStats
 import itertools
+import sys
 
-def calculateSignal(memory, permutation):
-    previous_output = 0
-    
+def calculateSignal(memory, permutation, cache = None):
+    # the feedback loop runs all amplifiers together, no prefix to share
     threads = [ThreadState(memory.copy(), 0, [phase], [], name) for phase, name in zip(permutation, ['A', 'B', 'C', 'D', 'E'])]
-    feedback_loop = itertools.cycle(threads)
-
-    for state in feedback_loop:
-        try:
-            state.input_stream.append(previous_output)
-            #print(f'Starting {state.name} with input {state.input_stream}. IP = {state.ip}')
-            interpretProgram(state)
-            if (state.name == 'E'):
-                break
-        except ProgramPause:
-            pass
-            #print(f'Pausing {state.name}. Output = {state.output[-1]}. IP = {state.ip}')
-        finally:
-            previous_output = state.output[-1]
-        
+    threads[0].input_stream.append(0)
+
+    runNetwork(threads, ring(len(threads)))
+
     return threads[-1].output[-1]
 
-def findConfiguration(memory):
+def findConfiguration(memory, workers = None):
     all_permutations = list(itertools.permutations(range(5,10), 5))
+
+    if workers:
+        max_signal, permutation, stats = searchPermutations(calculateSignal, memory, all_permutations, workers)
+        printWorkerStats(stats)
+        print(f'Max signal: |{max_signal}| for config |{permutation}|')
+        return
+
     max_signal = 0
 
     for permutation in all_permutations:
@@ -38,4 +36,5 @@ if __name__ == "__main__":
     with open('day7.txt', 'r') as f:
         memory = readProgram(f)
     
-    findConfiguration(memory)
\ No newline at end of file
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else None
+    findConfiguration(memory, workers)
\ No newline at end of file
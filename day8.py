@@ -1,48 +1,92 @@
-from functools import reduce
+import os
+from lazy import lazyImport
 
-def getLayers(numbers, width, height):
-    layersize = width * height
-    layers = []
-    for start in range(0, len(numbers), layersize):
-        layers.append(numbers[start:start + layersize])
-    return layers
+np = lazyImport('numpy')
 
-def analyze(numbers, width, height):
-    layers = getLayers(numbers, width, height)
-    
-    countzeros = lambda li: len([number for number in li if number == 0])
-    layers_with_zeroes = sorted([(countzeros(layer), layer) for layer in layers])
+TRANSPARENT = 2
+
+def decodeLayers(data, width, height) -> 'np.ndarray':
+    # data is a list of digits, or the raw bytes or a uint8 array (e.g. a
+    # memory-mapped slice) of digit characters
+    if isinstance(data, list):
+        return np.array(data, dtype=np.uint8).reshape(-1, height, width)
+    if isinstance(data, bytes):
+        data = np.frombuffer(data.strip(), dtype=np.uint8)
+    digits = data - np.uint8(ord('0'))
+    return digits.reshape(-1, height, width)
+
+def layerHistograms(layers: 'np.ndarray') -> 'np.ndarray':
+    # one digit at a time, so only a bool mask of the uint8 stack is ever allocated
+    return np.stack([np.count_nonzero(layers == digit, axis=(1, 2)) for digit in range(10)], axis=1)
 
-    selected = layers_with_zeroes[0][1]
+def fewestZeros(layers: 'np.ndarray') -> 'np.ndarray':
+    # digit histogram of the layer with the fewest zeros
+    histograms = layerHistograms(layers)
+    return histograms[np.argmin(histograms[:, 0])]
 
-    filter_num = lambda li, criteria: [number for number in li if number == criteria]
-    return len(filter_num(selected, 1)) * len(filter_num(selected, 2))
+def analyzeLayers(layers: 'np.ndarray') -> int:
+    selected = fewestZeros(layers)
+    return int(selected[1] * selected[2])
 
-def pixelAdd(left, right):
-    if left in [0, 1]:
-        return left
-    return right
+def composeLayers(layers: 'np.ndarray') -> 'np.ndarray':
+    first_visible = np.argmax(layers != TRANSPARENT, axis=0)
+    return np.take_along_axis(layers, first_visible[None], axis=0)[0]
+
+def analyze(numbers, width, height):
+    return analyzeLayers(decodeLayers(numbers, width, height))
 
 def render(numbers, width, height):
-    layers = getLayers(numbers, width, height)
-    layersize = len(layers[0])
+    printImage(composeLayers(decodeLayers(numbers, width, height)))
+
+def scanImage(path, width, height, layers_per_block = 1):
+    """Computes the checksum and the composed image of a SIF file in one pass.
+
+    The file is memory-mapped and decoded `layers_per_block` layers at a time,
+    so only the running image and the current block are held in memory.
+    Raises ValueError if the file does not hold a single complete layer.
+    """
+    error = f'Image file |{path}| holds no complete {width}x{height} layer'
+    if os.path.getsize(path) == 0:
+        # np.memmap can not map an empty file
+        raise ValueError(error)
+
+    mapped = np.memmap(path, dtype=np.uint8, mode='r')
+    end = len(mapped)
+    while end and int(mapped[end - 1]) in b'\r\n ':
+        end -= 1
+    end -= end % (width * height)
+    if end == 0:
+        raise ValueError(error)
+    block_size = width * height * layers_per_block
+
+    min_zeros = None
+    checksum = None
+    image = None
+    for start in range(0, end, block_size):
+        layers = decodeLayers(mapped[start:min(start + block_size, end)], width, height)
 
-    image = []
-    for i in range(layersize):
-        pixel = reduce(pixelAdd, [layer[i] for layer in layers])
-        image.append(pixel)
+        selected = fewestZeros(layers)
+        if min_zeros is None or selected[0] < min_zeros:
+            min_zeros = selected[0]
+            checksum = int(selected[1] * selected[2])
 
-    for m in range(height):
-        print(''.join([str(num)*3 for num in image[m * width:m*width + width]]))
-        print(''.join([str(num)*3 for num in image[m * width:m*width + width]]))
-        print(''.join([str(num)*3 for num in image[m * width:m*width + width]]))
-        
+        block_image = composeLayers(layers)
+        if image is None:
+            image = block_image
+        else:
+            image = composeLayers(np.stack([image, block_image]))
 
+    return checksum, image
 
+def printImage(image: 'np.ndarray'):
+    for row in image:
+        line = ''.join([str(num)*3 for num in row])
+        print(line)
+        print(line)
+        print(line)
 
 
 if __name__ == "__main__":
-    with open('day8.txt', 'r') as f:
-        numbers = [int(char) for char in str(f.readline())]
-    print(analyze(numbers, 25, 6))
-    render(numbers, 25, 6)
+    checksum, image = scanImage('day8.txt', 25, 6)
+    print(checksum)
+    printImage(image)
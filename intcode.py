@@ -1,5 +1,6 @@
 from typing import List
-from abc import ABC, abstractmethod
+from collections import deque
+from array import array
 from enum import IntEnum
 
 
@@ -12,272 +13,374 @@ class ProgramPause(Exception):
     pass
 
 
-class ThreadState(object):
-
-    def __init__(self, memory: List[int], ip: int, input_stream: List[int], output: List[int], name = None, relative_base: int = 0):
-        self.memory = memory
-        self.ip = ip
-        self.input_stream = input_stream
-        self.output = output
-        self.name = name
-        self.relative_base = relative_base
-
-class InstructionBase(ABC):
-
-    def __init__(self, operand1, operand1_mode = None, operand2 = None, operand2_mode = None, operand3 = None,  operand3_mode = None):
-        self.operand1 = operand1
-        self.operand2 = operand2
-        self.operand3 = operand3
-        self.operand1_mode = operand1_mode
-        self.operand2_mode = operand2_mode
-        self.operand3_mode = operand3_mode
-
-    def getPosition(self, state: ThreadState, operand: int, operand_mode: OperandMode) -> int:
-        if operand_mode == OperandMode.POSITION_MODE:
-            pos = state.memory[operand]
-        elif operand_mode == OperandMode.VALUE_MODE:
-            pos = operand
-        elif operand_mode == OperandMode.RELATIVE_MODE:
-            pos = state.relative_base + state.memory[operand]
+class PagedMemory(object):
+    """Intcode memory made of fixed-size pages allocated on first write.
+
+    Behaves like the list memory (indexing, len, extend) but growing it only
+    moves the end, so far relative-mode writes cost one page instead of a
+    dense list up to the address. Cells are signed 64-bit integers.
+
+    Pages are copy-on-write between a memory and its forks: a page is only
+    duplicated when one side writes to it.
+    """
+
+    def __init__(self, values: List[int] = (), page_size: int = 1024):
+        self.page_size = page_size
+        self.pages = {}
+        # indices of pages not shared with any fork, safe to write in place
+        self.owned = set()
+        self.length = 0
+        self.extend(values)
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __getitem__(self, pos):
+        if isinstance(pos, slice):
+            return [self[i] for i in range(*pos.indices(self.length))]
+        if not 0 <= pos < self.length:
+            raise IndexError(f'Memory address |{pos}| out of range')
+        page = self.pages.get(pos // self.page_size)
+        if page is None:
+            return 0
+        return page[pos % self.page_size]
+
+    def __setitem__(self, pos: int, value: int):
+        if not 0 <= pos < self.length:
+            raise IndexError(f'Memory address |{pos}| out of range')
+        page_index = pos // self.page_size
+        if page_index in self.owned:
+            page = self.pages[page_index]
         else:
-            raise ValueError(f'Invalid operand mode of |{operand_mode}|')
-
-        if pos >= len(state.memory):
-            missing = pos - len(state.memory) + 1
-            state.memory.extend([0] * missing)
-        return pos
-
-    @abstractmethod
-    def operate(self, state: ThreadState) -> ThreadState:
-        pass
-
-class UnaryInstruction(InstructionBase):
-
-    def __init__(self, operand1, operand1_mode = None):
-        super().__init__(operand1, operand1_mode)
-
-class BinaryInstruction(InstructionBase):
-
-    def __init__(self, operand1, operand1_mode = None, operand2 = None, operand2_mode = None):
-        super().__init__(operand1, operand1_mode, operand2, operand2_mode)
-
-
-class TernaryInstruction(InstructionBase):
-
-    def __init__(self, operator, operand1, operand1_mode = None, operand2 = None, operand2_mode = None, operand3 = None,  operand3_mode = None):
-        super().__init__(operand1, operand1_mode, operand2, operand2_mode, operand3, operand3_mode)
-        self.operator = operator
-
-    def operate(self, state: ThreadState) -> ThreadState:
-        memory = state.memory
-        a = memory[self.getPosition(state, self.operand1, self.operand1_mode)]
-        b = memory[self.getPosition(state, self.operand2, self.operand2_mode)]
-        value = self.operator(a, b)
-        memory[self.getPosition(state, self.operand3, self.operand3_mode)] = value
-        
-        state.ip += 4
-        return state
-
-class ReadInput(UnaryInstruction):
-
-    
-    def __init__(self, operand1, operand1_mode):
-        super().__init__(operand1, operand1_mode)
-
-    def operate(self, state: ThreadState) -> ThreadState:
-        if len(state.input_stream) == 0:
-            #print(f'{state.name} reading failed, halting. ip = {state.ip}')
-            raise ProgramPause('Empty input stream, waiting')
-        #print(f'{state.name} reading {state.input_stream[0]} to {state.memory[self.operand1]}. ip = {state.ip}')
-        state.memory[self.getPosition(state, self.operand1, self.operand1_mode)] = state.input_stream[0]
-        state.ip += 2
-        state.input_stream = state.input_stream[1:]
-        return state
-    
-    def __str__(self):
-        d = vars(self).copy()
-        return f'ReadInput |{d}|\n'
-
-    __repr__ = __str__
-
-class PrintOutput(UnaryInstruction):
-
-    
-    def __init__(self, operand1, operand1_mode):
-        super().__init__(operand1, operand1_mode)
-
-    def operate(self, state: ThreadState) -> ThreadState:
-        memory = state.memory
-        state.output.append(memory[self.getPosition(state, self.operand1, self.operand1_mode)])
-
-        state.ip += 2
-        return state
-    
-    def __str__(self):
-        d = vars(self).copy()
-        return f'PrintOutput |{d}|\n'
-
-    __repr__ = __str__
-
-class Add(TernaryInstruction):
-
-    def __init__(self, operand1, operand1_mode = None, operand2 = None, operand2_mode = None, operand3 = None,  operand3_mode = None):
-        operator = lambda x, y: x + y
-        super().__init__(operator, operand1, operand1_mode, operand2, operand2_mode, operand3, operand3_mode)
-
-    def __str__(self):
-        d = vars(self).copy()
-        del d['operator']
-        return f'Add |{d}|\n'
-
-    __repr__ = __str__
-
-class Multiply(TernaryInstruction):
-
-    def __init__(self, operand1, operand1_mode = None, operand2 = None, operand2_mode = None, operand3 = None,  operand3_mode = None):
-        operator = lambda x, y: x * y
-        super().__init__(operator, operand1, operand1_mode, operand2, operand2_mode, operand3, operand3_mode)
+            page = self.pages.get(page_index)
+            if page is None:
+                page = array('q', [0]) * self.page_size
+            else:
+                page = array('q', page)
+            self.pages[page_index] = page
+            self.owned.add(page_index)
+        page[pos % self.page_size] = value
 
+    def __iter__(self):
+        for pos in range(self.length):
+            yield self[pos]
 
     def __str__(self):
-        d = vars(self).copy()
-        del d['operator']
-        return f'Multiply |{d}|\n'
+        return str(list(self))
 
     __repr__ = __str__
 
+    def grow(self, length: int):
+        self.length = max(self.length, length)
 
-class JumpNonZero(BinaryInstruction):
+    def extend(self, values: List[int]):
+        start = self.length
+        self.grow(start + len(values))
+        for pos, value in enumerate(values, start):
+            if value:
+                self[pos] = value
 
-    def __init__(self, operand1, operand1_mode = None, operand2 = None, operand2_mode = None):
-        super().__init__(operand1, operand1_mode, operand2, operand2_mode)
+    def fork(self) -> 'PagedMemory':
+        child = PagedMemory(page_size=self.page_size)
+        child.length = self.length
+        child.pages = self.pages.copy()
+        self.owned = set()
+        return child
 
-    def operate(self, state: ThreadState) -> ThreadState:
-        memory = state.memory
-        expr = memory[self.getPosition(state, self.operand1, self.operand1_mode)]
-        pos = memory[self.getPosition(state, self.operand2, self.operand2_mode)]
-        if expr:
-            state.ip = pos
-        else:
-            state.ip += 3
+    copy = fork
 
-        return state
 
-    def __str__(self):
-        d = vars(self).copy()
-        return f'JumpNonZero |{d}|\n'
-
-    __repr__ = __str__
+def growMemory(memory, length: int):
+    if isinstance(memory, PagedMemory):
+        memory.grow(length)
+    else:
+        memory.extend([0] * (length - len(memory)))
 
-class JumpZero(BinaryInstruction):
 
-    def __init__(self, operand1, operand1_mode = None, operand2 = None, operand2_mode = None):
-        super().__init__(operand1, operand1_mode, operand2, operand2_mode)
+class ThreadState(object):
 
-    def operate(self, state: ThreadState) -> ThreadState:
-        memory = state.memory
-        expr = memory[self.getPosition(state, self.operand1, self.operand1_mode)]
-        pos = memory[self.getPosition(state, self.operand2, self.operand2_mode)]
-        if not expr:
-            state.ip = pos
+    def __init__(self, memory: List[int], ip: int, input_stream: List[int], output: List[int], name = None, relative_base: int = 0):
+        self.memory = memory
+        self.ip = ip
+        self.input_stream = input_stream
+        self.output = output
+        self.name = name
+        self.relative_base = relative_base
+        # ip -> (operation, mode1, mode2, mode3), see decodeInstruction
+        self.decode_cache = {}
+        # ring buffer of the last executed steps, only filled when tracing
+        self.trace = None
+        # number of instructions executed so far
+        self.steps = 0
+
+    @property
+    def input_stream(self) -> deque:
+        return self._input_stream
+
+    @input_stream.setter
+    def input_stream(self, values: List[int]):
+        # FIFO of pending inputs, plain lists are accepted and wrapped
+        self._input_stream = values if isinstance(values, deque) else deque(values)
+
+    def fork(self, input_stream: List[int] = None, name = None) -> 'ThreadState':
+        """Snapshots the machine.
+
+        PagedMemory is shared with the child page by page until either side
+        writes, list memory is copied. Load the program into PagedMemory to
+        branch many runs off one snapshot cheaply.
+        """
+        if isinstance(self.memory, PagedMemory):
+            memory = self.memory.fork()
         else:
-            state.ip += 3
-
-        return state
-
-    def __str__(self):
-        d = vars(self).copy()
-        return f'JumpZero |{d}|\n'
-
-    __repr__ = __str__
-    
-class LessThan(TernaryInstruction):
-
-    def __init__(self, operand1, operand1_mode = None, operand2 = None, operand2_mode = None, operand3 = None,  operand3_mode = None):
-        operator = lambda x, y: int(x < y)
-        super().__init__(operator, operand1, operand1_mode, operand2, operand2_mode, operand3, operand3_mode)
+            memory = self.memory.copy()
+        if input_stream is None:
+            input_stream = list(self.input_stream)
+
+        child = ThreadState(memory, self.ip, input_stream, list(self.output), name or self.name, self.relative_base)
+        child.decode_cache = self.decode_cache.copy()
+        child.steps = self.steps
+        return child
+
+
+def getAddress(state: ThreadState, address: int, mode: int) -> int:
+    memory = state.memory
+    if mode == OperandMode.POSITION_MODE:
+        pos = memory[address]
+    elif mode == OperandMode.VALUE_MODE:
+        pos = address
+    elif mode == OperandMode.RELATIVE_MODE:
+        pos = state.relative_base + memory[address]
+    else:
+        raise ValueError(f'Invalid operand mode of |{mode}|')
+
+    if pos >= len(memory):
+        growMemory(memory, pos + 1)
+    return pos
+
+def writeMemory(state: ThreadState, pos: int, value: int):
+    state.memory[pos] = value
+    # the program wrote over (possibly) decoded code, drop the stale entry
+    state.decode_cache.pop(pos, None)
+
+
+def add(state: ThreadState, ip: int, mode1: int, mode2: int, mode3: int) -> int:
+    memory = state.memory
+    a = memory[getAddress(state, ip + 1, mode1)]
+    b = memory[getAddress(state, ip + 2, mode2)]
+    writeMemory(state, getAddress(state, ip + 3, mode3), a + b)
+    return ip + 4
+
+def multiply(state: ThreadState, ip: int, mode1: int, mode2: int, mode3: int) -> int:
+    memory = state.memory
+    a = memory[getAddress(state, ip + 1, mode1)]
+    b = memory[getAddress(state, ip + 2, mode2)]
+    writeMemory(state, getAddress(state, ip + 3, mode3), a * b)
+    return ip + 4
+
+def readInput(state: ThreadState, ip: int, mode1: int, mode2: int, mode3: int) -> int:
+    if not state.input_stream:
+        raise ProgramPause('Empty input stream, waiting')
+    pos = getAddress(state, ip + 1, mode1)
+    writeMemory(state, pos, state.input_stream.popleft())
+    return ip + 2
+
+def printOutput(state: ThreadState, ip: int, mode1: int, mode2: int, mode3: int) -> int:
+    state.output.append(state.memory[getAddress(state, ip + 1, mode1)])
+    return ip + 2
+
+def jumpNonZero(state: ThreadState, ip: int, mode1: int, mode2: int, mode3: int) -> int:
+    memory = state.memory
+    if memory[getAddress(state, ip + 1, mode1)]:
+        return memory[getAddress(state, ip + 2, mode2)]
+    return ip + 3
+
+def jumpZero(state: ThreadState, ip: int, mode1: int, mode2: int, mode3: int) -> int:
+    memory = state.memory
+    if not memory[getAddress(state, ip + 1, mode1)]:
+        return memory[getAddress(state, ip + 2, mode2)]
+    return ip + 3
+
+def lessThan(state: ThreadState, ip: int, mode1: int, mode2: int, mode3: int) -> int:
+    memory = state.memory
+    a = memory[getAddress(state, ip + 1, mode1)]
+    b = memory[getAddress(state, ip + 2, mode2)]
+    writeMemory(state, getAddress(state, ip + 3, mode3), int(a < b))
+    return ip + 4
+
+def equals(state: ThreadState, ip: int, mode1: int, mode2: int, mode3: int) -> int:
+    memory = state.memory
+    a = memory[getAddress(state, ip + 1, mode1)]
+    b = memory[getAddress(state, ip + 2, mode2)]
+    writeMemory(state, getAddress(state, ip + 3, mode3), int(a == b))
+    return ip + 4
+
+def relativeBaseOffset(state: ThreadState, ip: int, mode1: int, mode2: int, mode3: int) -> int:
+    state.relative_base += state.memory[getAddress(state, ip + 1, mode1)]
+    return ip + 2
+
+
+HALT = 99
+
+OPERATIONS = {
+    1: add,
+    2: multiply,
+    3: readInput,
+    4: printOutput,
+    5: jumpNonZero,
+    6: jumpZero,
+    7: lessThan,
+    8: equals,
+    9: relativeBaseOffset,
+}
+
+OPERAND_COUNTS = {
+    add: 3,
+    multiply: 3,
+    readInput: 1,
+    printOutput: 1,
+    jumpNonZero: 2,
+    jumpZero: 2,
+    lessThan: 3,
+    equals: 3,
+    relativeBaseOffset: 1,
+}
+
+def decodeInstruction(value: int):
+    if value == HALT:
+        return None, 0, 0, 0
+
+    operation = OPERATIONS.get(value % 100)
+    if operation is None:
+        raise ValueError(f'Invalid opcode |{value}|')
+    return operation, value // 100 % 10, value // 1000 % 10, value // 10000 % 10
+
+
+def traceStep(state: ThreadState, ip: int, operation):
+    memory = state.memory
+    operands = tuple(memory[ip + i] for i in range(1, OPERAND_COUNTS[operation] + 1))
+    state.trace.append((ip, memory[ip], operands, state.relative_base))
+
+
+def runArithmetic(state: ThreadState) -> int:
+    """Fast path for position mode add/multiply code, as in the Day 2 programs.
+
+    Runs from state.ip until it meets any other instruction (including halt)
+    or an address past the end of memory, and returns the ip to continue
+    from. It skips the decode cache, so it must only run before the cache
+    is filled.
+    """
+    memory = state.memory
+    ip = state.ip
+    try:
+        while True:
+            opcode = memory[ip]
+            if opcode == 1:
+                memory[memory[ip + 3]] = memory[memory[ip + 1]] + memory[memory[ip + 2]]
+            elif opcode == 2:
+                memory[memory[ip + 3]] = memory[memory[ip + 1]] * memory[memory[ip + 2]]
+            else:
+                break
+            ip += 4
+    except IndexError:
+        # an address out of range, the general interpreter grows the memory
+        pass
 
-    def __str__(self):
-        d = vars(self).copy()
-        del d['operator']
-        return f'LessThan |{d}|\n'
+    state.steps += (ip - state.ip) // 4
+    state.ip = ip
+    return ip
 
-    __repr__ = __str__
 
-class Equals(TernaryInstruction):
+class AwaitingInput(object):
 
-    def __init__(self, operand1, operand1_mode = None, operand2 = None, operand2_mode = None, operand3 = None,  operand3_mode = None):
-        operator = lambda x, y: int(x == y)
-        super().__init__(operator, operand1, operand1_mode, operand2, operand2_mode, operand3, operand3_mode)
+    def __repr__(self):
+        return 'AWAITING_INPUT'
 
-    def __str__(self):
-        d = vars(self).copy()
-        del d['operator']
-        return f'Equals |{d}|\n'
+AWAITING_INPUT = AwaitingInput()
 
-    __repr__ = __str__
 
-class RelativeBaseOffset(UnaryInstruction):
+def executeProgram(state: ThreadState, trace: int = 0):
+    """Runs state as a generator until it halts.
 
-    def __init__(self, operand1, operand1_mode = None):
-        super().__init__(operand1, operand1_mode)
+    Yields every output value as it is produced (they are not kept in
+    state.output) and AWAITING_INPUT whenever the input stream is empty.
+    A value passed with send() is appended to the input stream.
+    With trace > 0 the last `trace` steps are kept in state.trace as
+    (ip, opcode, operands, relative_base) tuples, surviving pauses.
+    """
+    if trace and (state.trace is None or state.trace.maxlen != trace):
+        state.trace = deque(state.trace or (), maxlen=trace)
+    tracing = bool(trace)
 
-    def operate(self, state: ThreadState) -> ThreadState:
-        memory = state.memory
-        offset = memory[self.getPosition(state, self.operand1, self.operand1_mode)]
-        state.relative_base += offset
+    memory = state.memory
+    decode_cache = state.decode_cache
+    if not decode_cache and not tracing and type(memory) is list:
+        runArithmetic(state)
+    ip = state.ip
+    steps = state.steps
+    try:
+        while True:
+            decoded = decode_cache.get(ip)
+            if decoded is None:
+                decoded = decode_cache[ip] = decodeInstruction(memory[ip])
+            operation, mode1, mode2, mode3 = decoded
+            if operation is None:
+                break
+            if operation is readInput and not state.input_stream:
+                state.ip = ip
+                state.steps = steps
+                value = yield AWAITING_INPUT
+                # the state may have been forked (and its memory paged) meanwhile
+                memory = state.memory
+                if value is not None:
+                    state.input_stream.append(value)
+                continue
+            if tracing:
+                traceStep(state, ip, operation)
+            ip = operation(state, ip, mode1, mode2, mode3)
+            steps += 1
+            if operation is printOutput:
+                state.ip = ip
+                state.steps = steps
+                value = yield state.output.pop()
+                memory = state.memory
+                if value is not None:
+                    state.input_stream.append(value)
+    except Exception:
+        # locals are synced before every yield, so only write them back when
+        # the program itself failed, never when a paused generator is closed
+        state.ip = ip
+        state.steps = steps
+        raise
 
-        state.ip += 2
-        return state
+    state.ip = ip
+    state.steps = steps
 
-    def __str__(self):
-        d = vars(self).copy()
-        return f'RelativeBaseOffset |{d}|\n'
 
-    __repr__ = __str__
+VERBOSE_TRACE = 1000
 
+def interpretProgram(state: ThreadState, verbose: bool = False, trace: int = 0) -> List[int]:
+    """Runs state until it halts, raising ProgramPause when it waits for input.
 
-def interpretProgram(state: ThreadState, verbose: bool = False) -> List[int]:
-    instructions = []
+    Outputs are collected in state.output, see executeProgram for trace.
+    verbose prints the trace when the program halts, tracing the last
+    VERBOSE_TRACE steps unless trace is given.
+    """
+    if verbose and not trace:
+        trace = VERBOSE_TRACE
     try:
-        while state.memory[state.ip] != 99:
-            memory = state.memory
-            ip = state.ip
-            opcode = str(memory[ip]).rjust(5, '0')
-            mode1 = int(opcode[-3])
-            mode2 = int(opcode[-4])
-            mode3 = int(opcode[0])
-            if opcode[-2:] == '01':
-                instruction = Add(ip + 1, mode1, ip + 2, mode2, ip + 3, mode3)
-            elif opcode[-2:] == '02':
-                instruction = Multiply(ip + 1, mode1, ip + 2, mode2, ip + 3, mode3)
-            elif opcode[-2:] == '03':
-                instruction = ReadInput(ip + 1, mode1)
-            elif opcode[-2:] == '04':
-                instruction = PrintOutput(ip + 1, mode1)
-            elif opcode[-2:] == '05':
-                instruction = JumpNonZero(ip + 1, mode1, ip + 2, mode2)
-            elif opcode[-2:] == '06':
-                instruction = JumpZero(ip + 1, mode1, ip + 2, mode2)
-            elif opcode[-2:] == '07':
-                instruction = LessThan(ip + 1, mode1, ip + 2, mode2, ip + 3, mode3)
-            elif opcode[-2:] == '08':
-                instruction = Equals(ip + 1, mode1, ip + 2, mode2, ip + 3, mode3)
-            elif opcode[-2:] == '09':
-                instruction = RelativeBaseOffset(ip + 1, mode1)
-            else:
-                raise ValueError(f'Invalid opcode |{opcode}|')
-            
-            state = instruction.operate(state)
-            instructions.append(instruction)
+        for value in executeProgram(state, trace):
+            if value is AWAITING_INPUT:
+                raise ProgramPause('Empty input stream, waiting')
+            state.output.append(value)
     except ValueError:
         print(state.output)
-        print(instructions)
+        if state.trace:
+            print(list(state.trace))
         raise
 
-    if verbose:
-        print(instructions)
-    
+    if verbose and state.trace:
+        print(list(state.trace))
+
     return state.output
 
 
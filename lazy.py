@@ -0,0 +1,28 @@
+import importlib
+
+
+class LazyModule(object):
+    """Stands in for a module and imports it on first attribute access."""
+
+    def __init__(self, name):
+        self.__dict__['name'] = name
+        self.__dict__['module'] = None
+
+    def load(self):
+        if self.__dict__['module'] is None:
+            self.__dict__['module'] = importlib.import_module(self.__dict__['name'])
+        return self.__dict__['module']
+
+    def __getattr__(self, attribute):
+        return getattr(self.load(), attribute)
+
+    def __repr__(self):
+        return f'LazyModule |{self.__dict__["name"]}|'
+
+
+def lazyImport(name) -> LazyModule:
+    return LazyModule(name)
+
+
+def sign(x):
+    return (x > 0) - (x < 0)
@@ -0,0 +1,155 @@
+import struct
+import zlib
+from lazy import lazyImport
+
+np = lazyImport('numpy')
+
+# clockwise starting up, turning right is +1 and turning left -1
+DIRECTIONS = ((0, 1), (1, 0), (0, -1), (-1, 0))
+
+
+class PaintingGrid(object):
+    """Hull painting that knows its bounds and which panels were painted.
+
+    Starts as a dict of panels and switches to growable NumPy arrays once
+    the painted panels cover at least `dense_ratio` of the bounding box.
+    y grows upwards, as for the painting robot.
+    """
+
+    def __init__(self, default = 0, dense_ratio = 0.25, min_dense_size = 1024):
+        self.default = default
+        self.dense_ratio = dense_ratio
+        self.min_dense_size = min_dense_size
+        self.cells = dict()
+        self.colors = None
+        self.painted = None
+        # array cell [0, 0] is panel (origin_x, origin_y)
+        self.origin_x = 0
+        self.origin_y = 0
+        self.count = 0
+        self.bounds = None
+
+    @classmethod
+    def fromDict(cls, painting, default = 0):
+        grid = cls(default)
+        for position, color in painting.items():
+            grid[position] = color
+        return grid
+
+    def isDense(self):
+        return self.colors is not None
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, position):
+        if not self.isDense():
+            return position in self.cells
+        row, column = self.arrayIndex(position)
+        return 0 <= row < self.painted.shape[0] and 0 <= column < self.painted.shape[1] and bool(self.painted[row, column])
+
+    def __getitem__(self, position):
+        if not self.isDense():
+            return self.cells.get(position, self.default)
+        if position not in self:
+            return self.default
+        return int(self.colors[self.arrayIndex(position)])
+
+    def __setitem__(self, position, color):
+        x, y = position
+        if self.bounds is None:
+            self.bounds = [x, x, y, y]
+        else:
+            bounds = self.bounds
+            bounds[0], bounds[1] = min(bounds[0], x), max(bounds[1], x)
+            bounds[2], bounds[3] = min(bounds[2], y), max(bounds[3], y)
+
+        if not self.isDense():
+            if position not in self.cells:
+                self.count += 1
+            self.cells[position] = color
+            if self.count >= self.min_dense_size and self.count >= self.dense_ratio * self.area():
+                self.densify()
+            return
+
+        self.ensureBounds()
+        index = self.arrayIndex(position)
+        if not self.painted[index]:
+            self.count += 1
+            self.painted[index] = True
+        self.colors[index] = color
+
+    def area(self):
+        min_x, max_x, min_y, max_y = self.bounds
+        return (max_x - min_x + 1) * (max_y - min_y + 1)
+
+    def arrayIndex(self, position):
+        return position[1] - self.origin_y, position[0] - self.origin_x
+
+    def ensureBounds(self):
+        min_x, max_x, min_y, max_y = self.bounds
+        height, width = self.colors.shape
+        if self.origin_x <= min_x and max_x < self.origin_x + width and self.origin_y <= min_y and max_y < self.origin_y + height:
+            return
+
+        # grow by doubling so a robot walking off an edge does not reallocate every step
+        new_width = max(max_x - min_x + 1, 2 * width)
+        new_height = max(max_y - min_y + 1, 2 * height)
+        origin_x = min(self.origin_x, min_x - (new_width - (max_x - min_x + 1)) // 2)
+        origin_y = min(self.origin_y, min_y - (new_height - (max_y - min_y + 1)) // 2)
+        new_width = max(new_width, self.origin_x + width - origin_x, max_x - origin_x + 1)
+        new_height = max(new_height, self.origin_y + height - origin_y, max_y - origin_y + 1)
+
+        colors = np.full((new_height, new_width), self.default, dtype=np.uint8)
+        painted = np.zeros((new_height, new_width), dtype=bool)
+        top, left = self.origin_y - origin_y, self.origin_x - origin_x
+        colors[top:top + height, left:left + width] = self.colors
+        painted[top:top + height, left:left + width] = self.painted
+        self.colors, self.painted = colors, painted
+        self.origin_x, self.origin_y = origin_x, origin_y
+
+    def densify(self):
+        min_x, max_x, min_y, max_y = self.bounds
+        self.origin_x, self.origin_y = min_x, min_y
+        self.colors = np.full((max_y - min_y + 1, max_x - min_x + 1), self.default, dtype=np.uint8)
+        self.painted = np.zeros(self.colors.shape, dtype=bool)
+        for position, color in self.cells.items():
+            index = self.arrayIndex(position)
+            self.colors[index] = color
+            self.painted[index] = True
+        self.cells = None
+
+    def raster(self):
+        """Colors inside the bounds as a (rows, columns) array, top row first."""
+        if self.bounds is None:
+            return np.zeros((0, 0), dtype=np.uint8)
+        min_x, max_x, min_y, max_y = self.bounds
+        if self.isDense():
+            top, left = min_y - self.origin_y, min_x - self.origin_x
+            image = self.colors[top:top + max_y - min_y + 1, left:left + max_x - min_x + 1]
+        else:
+            image = np.full((max_y - min_y + 1, max_x - min_x + 1), self.default, dtype=np.uint8)
+            for (x, y), color in self.cells.items():
+                image[y - min_y, x - min_x] = color
+        return image[::-1]
+
+    def toASCII(self, on = '#', off = ' '):
+        return '\n'.join(''.join(on if color else off for color in row) for row in self.raster())
+
+    def toPBM(self):
+        # P4 bitmap, painted white panels are drawn as black pixels
+        image = self.raster()
+        rows = np.packbits(image != 0, axis=1)
+        return b'P4\n%d %d\n' % (image.shape[1], image.shape[0]) + rows.tobytes()
+
+    def toPNG(self):
+        image = np.where(self.raster() != 0, 255, 0).astype(np.uint8)
+        height, width = image.shape
+        # every scanline starts with filter type 0
+        scanlines = np.hstack([np.zeros((height, 1), dtype=np.uint8), image]).tobytes()
+
+        def chunk(kind, data):
+            return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data) & 0xffffffff)
+
+        header = struct.pack('>IIBBBBB', width, height, 8, 0, 0, 0, 0)
+        return b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', header) + chunk(b'IDAT', zlib.compress(scanlines)) + chunk(b'IEND', b'')
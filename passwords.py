@@ -0,0 +1,46 @@
+from functools import lru_cache
+
+
+def acceptsRun(run, exact_pair):
+    return run == 2 if exact_pair else run >= 2
+
+def appendDigit(digit, last, run, satisfied, exact_pair):
+    # runs are capped at 3, longer ones behave the same for both rules
+    if run and digit == last:
+        return digit, min(run + 1, 3), satisfied
+    return digit, 1, satisfied or acceptsRun(run, exact_pair)
+
+@lru_cache(maxsize=None)
+def countCompletions(remaining, last, run, satisfied, exact_pair):
+    if remaining == 0:
+        return int(satisfied or acceptsRun(run, exact_pair))
+
+    return sum(countCompletions(remaining - 1, *appendDigit(digit, last, run, satisfied, exact_pair), exact_pair)
+        for digit in range(last, 10))
+
+def countBelow(bound, digits, exact_pair):
+    """Counts zero padded `digits` long non-decreasing candidates below bound."""
+    if bound >= 10 ** digits:
+        return countCompletions(digits, 0, 0, False, exact_pair)
+
+    count = 0
+    last, run, satisfied = 0, 0, False
+    for i, bound_digit in enumerate(int(char) for char in str(bound).rjust(digits, '0')):
+        for digit in range(last, bound_digit):
+            count += countCompletions(digits - i - 1, *appendDigit(digit, last, run, satisfied, exact_pair), exact_pair)
+        if bound_digit < last:
+            break
+        last, run, satisfied = appendDigit(bound_digit, last, run, satisfied, exact_pair)
+
+    return count
+
+def countPasswords(low, high, exact_pair = False, digits = 6):
+    """Counts the `digits` long numbers in range(low, high) with non-decreasing digits
+    and a run of at least two equal digits, or exactly two with exact_pair.
+    """
+    low = max(low, 10 ** (digits - 1))
+    high = min(high, 10 ** digits)
+    if low >= high:
+        return 0
+
+    return countBelow(high, digits, exact_pair) - countBelow(low, digits, exact_pair)
@@ -0,0 +1,123 @@
+from typing import List, Sequence, Tuple
+from itertools import product
+from intcode import executeProgram, writeMemory, ThreadState, PagedMemory, ProgramPause, AWAITING_INPUT
+from lazy import lazyImport
+
+futures = lazyImport('concurrent.futures')
+multiprocessing = lazyImport('multiprocessing')
+
+
+def evaluate(snapshot: ThreadState, positions: Sequence[int], values: Sequence[int], output_position: int = 0) -> int:
+    # the trial shares the snapshot's memory pages until it writes to them
+    trial = snapshot.fork()
+    for position, value in zip(positions, values):
+        writeMemory(trial, position, value)
+
+    for value in executeProgram(trial):
+        if value is AWAITING_INPUT:
+            raise ProgramPause('Program expects input')
+    return trial.memory[output_position]
+
+def tryEvaluate(snapshot, positions, values, output_position):
+    try:
+        return evaluate(snapshot, positions, values, output_position)
+    except (ValueError, IndexError, OverflowError, ProgramPause):
+        # this combination crashes the program, it can not be a solution
+        return None
+
+
+def solveAffine(snapshot, target, positions, ranges, output_position):
+    """Solves target == c + sum(a_i * values_i) from a few probe runs.
+
+    Returns the first matching values, or None if the program does not look
+    affine in its parameters or has no solution in the ranges.
+    """
+    base = [r[0] for r in ranges]
+    constant = tryEvaluate(snapshot, positions, base, output_position)
+    if constant is None:
+        return None
+
+    coefficients = []
+    for i, r in enumerate(ranges):
+        if len(r) < 2:
+            coefficients.append(0)
+            continue
+        probe = base.copy()
+        probe[i] = r[1]
+        value = tryEvaluate(snapshot, positions, probe, output_position)
+        if value is None or (value - constant) % (r[1] - r[0]):
+            return None
+        coefficients.append((value - constant) // (r[1] - r[0]))
+
+    predict = lambda values: constant + sum(a * (v - b) for a, v, b in zip(coefficients, values, base))
+    check = [r[-1] for r in ranges]
+    if tryEvaluate(snapshot, positions, check, output_position) != predict(check):
+        return None
+
+    *outer, last = ranges
+    for values in product(*outer):
+        remainder = target - predict(values + (last[0],))
+        if coefficients[-1] == 0:
+            candidates = [last[0]] if remainder == 0 else []
+        elif remainder % coefficients[-1] == 0:
+            candidates = [last[0] + remainder // coefficients[-1]]
+        else:
+            candidates = []
+
+        for candidate in candidates:
+            # the probes only suggest affinity, confirm with a real run
+            if candidate in last and tryEvaluate(snapshot, positions, values + (candidate,), output_position) == target:
+                return values + (candidate,)
+
+    return None
+
+
+best_row = None
+
+def setBestRow(value):
+    global best_row
+    best_row = value
+
+def searchRows(snapshot, target, positions, first_values, rows, other_ranges, output_position):
+    # returns (row, values) of the first match among the given rows of the grid
+    for row in rows:
+        if best_row.value < row:
+            # an earlier row already matched, this one can not be the first
+            return None
+        for rest in product(*other_ranges):
+            values = (first_values[row],) + rest
+            if tryEvaluate(snapshot, positions, values, output_position) == target:
+                with best_row.get_lock():
+                    best_row.value = min(best_row.value, row)
+                return row, values
+    return None
+
+def searchGrid(snapshot, target, positions, ranges, output_position, workers = None):
+    workers = workers or multiprocessing.cpu_count()
+    first, *others = ranges
+    chunks = [range(i, len(first), workers) for i in range(min(workers, len(first)))]
+
+    best = multiprocessing.Value('q', len(first))
+    with futures.ProcessPoolExecutor(len(chunks), initializer=setBestRow, initargs=(best,)) as executor:
+        submitted = [executor.submit(searchRows, snapshot, target, positions, first, chunk, others, output_position) for chunk in chunks]
+        results = [future.result() for future in submitted]
+
+    found = [result for result in results if result is not None]
+    return min(found)[1] if found else None
+
+
+def findInputs(memory: List[int], target: int, positions: Sequence[int] = (1, 2), ranges: Sequence[range] = (range(100), range(100)),
+        output_position: int = 0, workers: int = None) -> Tuple[int]:
+    """Finds values for the memory cells at positions making the program leave target at output_position.
+
+    Programs affine in their parameters are solved from a few runs, others
+    are searched exhaustively by a process pool whose workers skip the rows
+    after the earliest matching one. Either way the first match in the order
+    of the ranges is returned, or None if no combination works.
+    """
+    ranges = [range(r) if isinstance(r, int) else r for r in ranges]
+    snapshot = ThreadState(PagedMemory(memory), 0, [], [])
+    solution = solveAffine(snapshot, target, positions, ranges, output_position)
+    if solution is None:
+        solution = searchGrid(snapshot, target, positions, ranges, output_position, workers)
+    return solution
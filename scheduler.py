@@ -0,0 +1,108 @@
+from typing import List, Tuple
+from intcode import executeProgram, ThreadState, AWAITING_INPUT
+from lazy import lazyImport
+
+asyncio = lazyImport('asyncio')
+
+
+def pipeline(size: int) -> List[Tuple[int, int]]:
+    return [(i, i + 1) for i in range(size - 1)]
+
+def ring(size: int) -> List[Tuple[int, int]]:
+    return [(i, (i + 1) % size) for i in range(size)]
+
+
+class NetworkDeadlock(Exception):
+    pass
+
+
+async def runMachine(state: ThreadState, receive, send):
+    # receive() and send(value) are the coroutines moving values over the network
+    machine = executeProgram(state)
+    try:
+        value = next(machine)
+        while True:
+            if value is AWAITING_INPUT:
+                value = machine.send(await receive())
+            else:
+                state.output.append(value)
+                await send(value)
+                value = next(machine)
+    except StopIteration:
+        pass
+
+async def drain(inbox: 'asyncio.Queue'):
+    # keeps senders to a halted machine from blocking on its full inbox
+    while True:
+        await inbox.get()
+
+async def scheduleNetwork(states: List[ThreadState], edges: List[Tuple[int, int]], capacity: int = 16):
+    """Runs the machines as asyncio tasks until all of them halt.
+
+    Every (source, destination) edge forwards the outputs of source to the
+    input of destination through a queue holding at most `capacity` values,
+    a full queue suspends the sender. Outputs are also kept in state.output.
+    Raises NetworkDeadlock once every running machine waits on an empty
+    inbox or a full outbox.
+    """
+    inboxes = [asyncio.Queue(capacity) for _ in states]
+    destinations = [[] for _ in states]
+    for source, destination in edges:
+        destinations[source].append(destination)
+
+    live = set(range(len(states)))
+    # i -> None while machine i runs, else the index of the inbox it waits on
+    waiting = [None] * len(states)
+    drains = []
+
+    def isBlocked(i):
+        target = waiting[i]
+        if target is None:
+            return False
+        if target == i:
+            return inboxes[i].empty()
+        # a halted machine's inbox is drained, senders to it always move on
+        return target in live and inboxes[target].full()
+
+    def checkDeadlock():
+        if live and all(isBlocked(i) for i in live):
+            names = [states[i].name or i for i in sorted(live)]
+            raise NetworkDeadlock(f'Machines |{names}| are all waiting on each other')
+
+    def connect(i):
+        inbox = inboxes[i]
+
+        async def receive():
+            if inbox.empty():
+                waiting[i] = i
+                checkDeadlock()
+            value = await inbox.get()
+            waiting[i] = None
+            return value
+
+        async def send(value):
+            for destination in destinations[i]:
+                outbox = inboxes[destination]
+                if outbox.full():
+                    waiting[i] = destination
+                    checkDeadlock()
+                await outbox.put(value)
+                waiting[i] = None
+
+        return receive, send
+
+    async def run(i):
+        await runMachine(states[i], *connect(i))
+        live.discard(i)
+        drains.append(asyncio.create_task(drain(inboxes[i])))
+        checkDeadlock()
+
+    try:
+        await asyncio.gather(*[run(i) for i in range(len(states))])
+    finally:
+        for task in drains:
+            task.cancel()
+
+def runNetwork(states: List[ThreadState], edges: List[Tuple[int, int]], capacity: int = 16) -> List[ThreadState]:
+    asyncio.run(scheduleNetwork(states, edges, capacity))
+    return states
@@ -0,0 +1,25 @@
+import glob
+import os
+import subprocess
+import sys
+
+MEASURE = 'import time; start = time.perf_counter(); import {module}; print(time.perf_counter() - start)'
+
+
+def entryPoints(directory = '.'):
+    return sorted(os.path.basename(path)[:-3] for path in glob.glob(os.path.join(directory, 'day*.py')))
+
+def measureImportTime(module, directory = '.'):
+    # a fresh interpreter per entry point, as a batch run would pay it
+    result = subprocess.run([sys.executable, '-c', MEASURE.format(module=module)], cwd=directory,
+        stdin=subprocess.DEVNULL, capture_output=True, text=True)
+    if result.returncode != 0:
+        return None
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+if __name__ == "__main__":
+    directory = sys.argv[1] if len(sys.argv) > 1 else os.path.dirname(os.path.abspath(__file__))
+    for module in entryPoints(directory):
+        seconds = measureImportTime(module, directory)
+        print(f'{module:8} ' + ('failed' if seconds is None else f'{seconds * 1000:8.1f} ms'))
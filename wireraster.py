@@ -0,0 +1,50 @@
+from lazy import lazyImport
+from wires import DIRECTIONS
+
+np = lazyImport('numpy')
+
+
+def rasterizeWire(instructions):
+    """Returns int32 arrays x, y, step of every grid point the wire visits.
+
+    The origin (step 0) is left out, a point visited twice appears twice.
+    """
+    dx = np.array([DIRECTIONS[instruction[0]][0] for instruction in instructions], dtype=np.int32)
+    dy = np.array([DIRECTIONS[instruction[0]][1] for instruction in instructions], dtype=np.int32)
+    lengths = np.array([int(instruction[1:]) for instruction in instructions], dtype=np.int64)
+
+    x = np.cumsum(np.repeat(dx, lengths), dtype=np.int32)
+    y = np.cumsum(np.repeat(dy, lengths), dtype=np.int32)
+    step = np.arange(1, len(x) + 1, dtype=np.int32)
+    return x, y, step
+
+def packPoints(x, y):
+    return (x.astype(np.int64) << 32) | (y.astype(np.int64) & 0xffffffff)
+
+def firstVisits(wire):
+    x, y, step = wire
+    # np.unique reports the first occurrence of each point, the earliest step
+    keys, first = np.unique(packPoints(x, y), return_index=True)
+    return keys, step[first]
+
+def rasterIntersections(wire1, wire2):
+    """Returns arrays x, y, steps1, steps2 of the crossings of two rasterized wires, except the origin."""
+    keys1, steps1 = firstVisits(wire1)
+    keys2, steps2 = firstVisits(wire2)
+    keys, index1, index2 = np.intersect1d(keys1, keys2, assume_unique=True, return_indices=True)
+    # wires crossing back over the origin do not count
+    crossing = keys != 0
+    keys, index1, index2 = keys[crossing], index1[crossing], index2[crossing]
+
+    x = (keys >> 32).astype(np.int32)
+    y = (keys & 0xffffffff).astype(np.uint32).view(np.int32)
+    return x, y, steps1[index1], steps2[index2]
+
+
+def closestDistance(instructions1, instructions2):
+    x, y, _, _ = rasterIntersections(rasterizeWire(instructions1), rasterizeWire(instructions2))
+    return int((np.abs(x.astype(np.int64)) + np.abs(y.astype(np.int64))).min())
+
+def fewestSteps(instructions1, instructions2):
+    _, _, steps1, steps2 = rasterIntersections(rasterizeWire(instructions1), rasterizeWire(instructions2))
+    return int((steps1.astype(np.int64) + steps2).min())
@@ -0,0 +1,103 @@
+from bisect import bisect_left, bisect_right, insort
+from collections import defaultdict
+
+DIRECTIONS = {'L': (-1, 0), 'R': (1, 0), 'D': (0, -1), 'U': (0, 1)}
+
+
+def parseSegments(instructions):
+    """Turns wire instructions into (x1, y1, x2, y2, steps) segments.
+
+    steps is the wire length walked before the segment starts.
+    """
+    segments = []
+    x, y = 0, 0
+    steps = 0
+    for instruction in instructions:
+        dx, dy = DIRECTIONS[instruction[0]]
+        length = int(instruction[1:])
+        segments.append((x, y, x + dx * length, y + dy * length, steps))
+        x, y = x + dx * length, y + dy * length
+        steps += length
+
+    return segments
+
+def isHorizontal(segment):
+    return segment[1] == segment[3]
+
+def stepsTo(segment, x, y):
+    return segment[4] + abs(x - segment[0]) + abs(y - segment[1])
+
+
+def perpendicularCrossings(horizontals, verticals):
+    # sweep along x with the horizontals currently spanning it sorted by y
+    INSERT, QUERY, REMOVE = 0, 1, 2
+    events = []
+    for i, (x1, y1, x2, y2, _) in enumerate(horizontals):
+        events.append((min(x1, x2), INSERT, i))
+        events.append((max(x1, x2), REMOVE, i))
+    for i, (x1, _, _, _, _) in enumerate(verticals):
+        events.append((x1, QUERY, i))
+    events.sort()
+
+    active = []
+    for x, kind, i in events:
+        if kind == INSERT:
+            insort(active, (horizontals[i][1], i))
+        elif kind == REMOVE:
+            del active[bisect_left(active, (horizontals[i][1], i))]
+        else:
+            vertical = verticals[i]
+            low, high = sorted((vertical[1], vertical[3]))
+            for y, j in active[bisect_left(active, (low, -1)):bisect_right(active, (high, len(horizontals)))]:
+                yield x, y, horizontals[j], vertical
+
+def collinearCrossings(segments1, segments2, axis):
+    # segments on the same line overlap in an interval, only its endpoints,
+    # the point closest to the origin and that point's neighbours can be optimal
+    along = 1 - axis
+    lines = defaultdict(list)
+    for segment in segments2:
+        lines[segment[axis]].append(segment)
+
+    for segment1 in segments1:
+        low1, high1 = sorted((segment1[along], segment1[along + 2]))
+        for segment2 in lines.get(segment1[axis], ()):
+            low2, high2 = sorted((segment2[along], segment2[along + 2]))
+            low, high = max(low1, low2), min(high1, high2)
+            if low > high:
+                continue
+            closest = min(max(0, low), high)
+            for position in {low, high, closest - 1, closest, closest + 1}:
+                if low <= position <= high:
+                    point = [0, 0]
+                    point[axis] = segment1[axis]
+                    point[along] = position
+                    yield point[0], point[1], segment1, segment2
+
+def intersections(instructions1, instructions2):
+    """Yields (x, y, steps1, steps2) for the wire crossings, except the origin."""
+    segments1 = parseSegments(instructions1)
+    segments2 = parseSegments(instructions2)
+    horizontals1 = [segment for segment in segments1 if isHorizontal(segment)]
+    verticals1 = [segment for segment in segments1 if not isHorizontal(segment)]
+    horizontals2 = [segment for segment in segments2 if isHorizontal(segment)]
+    verticals2 = [segment for segment in segments2 if not isHorizontal(segment)]
+
+    crossings = [
+        ((x, y, segment1, segment2) for x, y, segment1, segment2 in perpendicularCrossings(horizontals1, verticals2)),
+        ((x, y, segment1, segment2) for x, y, segment2, segment1 in perpendicularCrossings(horizontals2, verticals1)),
+        collinearCrossings(horizontals1, horizontals2, 1),
+        collinearCrossings(verticals1, verticals2, 0),
+    ]
+    for crossing in crossings:
+        for x, y, segment1, segment2 in crossing:
+            if (x, y) != (0, 0):
+                yield x, y, stepsTo(segment1, x, y), stepsTo(segment2, x, y)
+
+
+def closestDistance(instructions1, instructions2):
+    return min(abs(x) + abs(y) for x, y, _, _ in intersections(instructions1, instructions2))
+
+def fewestSteps(instructions1, instructions2):
+    # summing the first visits of both wires equals the minimum over every crossing pair
+    return min(steps1 + steps2 for _, _, steps1, steps2 in intersections(instructions1, instructions2))